@@ -5,15 +5,20 @@ Perfect for deployment on Railway.
 """
 
 import asyncio
+import heapq
 import json
 import os
+import sys
+import time
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Final, Optional, Set, Tuple
+from dataclasses import dataclass, asdict, field
 from enum import Enum
+from operator import attrgetter
 
 from fastmcp import FastMCP
 from pydantic import BaseModel, Field
+from sortedcontainers import SortedList
 
 
 # Data models
@@ -31,7 +36,9 @@ class Priority(str, Enum):
     URGENT = "urgent"
 
 
-class Task(BaseModel):
+# Tasks live only inside TaskStorage; requests are validated by the Pydantic models below
+@dataclass(slots=True, kw_only=True)
+class Task:
     id: str
     title: str
     description: Optional[str] = None
@@ -40,7 +47,50 @@ class Task(BaseModel):
     created_at: datetime
     due_date: Optional[datetime] = None
     completed_at: Optional[datetime] = None
-    tags: List[str] = Field(default_factory=list)
+    tags: List[str] = field(default_factory=list)
+    
+    # Sort rank of `priority` (see _PRIORITY_ORDER), kept in step with it by TaskStorage
+    priority_rank: int = field(init=False, repr=False)
+    # Integer storage key; `id` is its string form, used only at the API boundary
+    _key: int = field(default=0, init=False, repr=False)
+    # POSIX timestamp of due_date keying the overdue heap, computed before the task is stored
+    _due_ts: Optional[float] = field(default=None, init=False, repr=False)
+    # Timestamp of this task's entry still waiting in the overdue heap, if any
+    _heap_ts: Optional[float] = field(default=None, init=False, repr=False)
+    # Pre-rendered markdown fragments for the task resource. created_at never
+    # changes; the status and priority lines are refreshed when those change.
+    _created_str: str = field(default="", init=False, repr=False)
+    _status_line: str = field(default="", init=False, repr=False)
+    _priority_line: str = field(default="", init=False, repr=False)
+    
+    def __post_init__(self) -> None:
+        self._created_str = self.created_at.strftime(_DISPLAY_DATE_FORMAT)
+        self._refresh_status()
+        self._refresh_priority()
+    
+    def _refresh_status(self) -> None:
+        status = self.status.value
+        self._status_line = f"{_STATUS_EMOJI[status]} **Status**: {status.title()}"
+    
+    def _refresh_priority(self) -> None:
+        priority = self.priority.value
+        self.priority_rank = _PRIORITY_ORDER[self.priority]
+        self._priority_line = f"{_PRIORITY_EMOJI[priority]} **Priority**: {priority.title()}"
+    
+    def to_json_dict(self) -> Dict[str, Any]:
+        # Datetimes are left as-is: FastMCP encodes tool results with pydantic-core,
+        # which formats them natively instead of through Python-level isoformat()
+        return {
+            "id": self.id,
+            "title": self.title,
+            "description": self.description,
+            "status": self.status.value,
+            "priority": self.priority.value,
+            "created_at": self.created_at,
+            "due_date": self.due_date,
+            "completed_at": self.completed_at,
+            "tags": list(self.tags),
+        }
 
 
 class CreateTaskRequest(BaseModel):
@@ -60,109 +110,327 @@ class UpdateTaskRequest(BaseModel):
     tags: Optional[List[str]] = None
 
 
+class BadDueDate(ValueError):
+    """Raised by TaskStorage when a due_date string is not valid ISO 8601 or has no POSIX timestamp."""
+
+
+# Display formatting for the markdown resources, keyed by raw enum values
+_STATUS_EMOJI: Final[Dict[str, str]] = {"todo": "📋", "in_progress": "⏳", "completed": "✅", "cancelled": "❌"}
+_PRIORITY_EMOJI: Final[Dict[str, str]] = {"low": "🟢", "medium": "🟡", "high": "🟠", "urgent": "🔴"}
+_DISPLAY_DATE_FORMAT: Final = '%Y-%m-%d %H:%M:%S'
+
+# Sort rank used when listing tasks (most urgent first)
+_PRIORITY_ORDER: Dict[Priority, int] = {Priority.URGENT: 0, Priority.HIGH: 1, Priority.MEDIUM: 2, Priority.LOW: 3}
+
+# Upper bound on deleted Task objects TaskStorage keeps around for reuse
+_TASK_FREELIST_CAPACITY: Final = 1024
+
+
+try:
+    # Optional C extension, several times faster than datetime.fromisoformat
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    # datetime.fromisoformat accepts a trailing 'Z' from Python 3.11 on
+    if sys.version_info >= (3, 11):
+        _parse_iso = datetime.fromisoformat
+    else:
+        def _parse_iso(value: str) -> datetime:
+            return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+# (monotonic time, datetime) of the last wall-clock read made by _now
+_now_cache: Tuple[float, datetime] = (float('-inf'), datetime.min)
+
+
+def _now() -> datetime:
+    """datetime.now(), reused for up to 1ms so bursts of mutations share one timestamp."""
+    global _now_cache
+    mono = time.monotonic()
+    if mono - _now_cache[0] > 0.001:
+        _now_cache = (mono, datetime.now())
+    return _now_cache[1]
+
+
+def _parse_due_date(value: str) -> Tuple[datetime, float]:
+    """Parse a due_date string into the datetime and the POSIX timestamp keying the overdue heap."""
+    try:
+        due_date = _parse_iso(value)
+        # Naive dates are taken as local time, matching the datetime.now() they used to be compared to
+        return due_date, due_date.timestamp()
+    except (ValueError, OverflowError, OSError) as e:
+        raise BadDueDate(f"Invalid due_date: {value}") from e
+
+
+def _task_key(task_id: str) -> Optional[int]:
+    """Convert an API task id to its storage key, or None if no task could have that id."""
+    # Only canonical ids match: int() alone would also accept " 1", "+1", "01" and "1_0"
+    if not (task_id.isascii() and task_id.isdigit() and (task_id == "0" or task_id[0] != "0")):
+        return None
+    try:
+        return int(task_id)
+    except ValueError:
+        # Longer than int()'s digit limit, so no task can have this id
+        return None
+
+
 # Simple in-memory storage (in production, use a real database)
 class TaskStorage:
     def __init__(self):
-        self.tasks: Dict[str, Task] = {}
+        # All storage structures are keyed by the integer task id
+        self.tasks: Dict[int, Task] = {}
+        # Response dicts kept in sync with self.tasks, rebuilt only when a task changes
+        self._json_cache: Dict[int, Dict[str, Any]] = {}
+        # Secondary indexes, updated incrementally by create/update/delete
+        self._by_status: Dict[TaskStatus, Set[int]] = {status: set() for status in TaskStatus}
+        self._by_tag: Dict[str, Set[int]] = {}
+        self._by_priority_counts: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        # (priority rank, created_at, key) of every task, in listing order
+        self._ordered = SortedList()
+        # Min-heap of (due timestamp, key) for tasks with a due date. Entries are checked
+        # lazily as they expire; open tasks found overdue move to self._overdue.
+        self._due_heap: List[Tuple[float, int]] = []
+        self._overdue: Set[int] = set()
+        # Deleted Task objects kept for reuse by create_task
+        self._free_tasks: List[Task] = []
+        # Views rendered by the resources and prompt, dropped by _invalidate when the data changes
+        self._task_markdown: Dict[int, str] = {}
+        self._summary_markdown: Optional[str] = None
+        self._stats_json: Optional[str] = None
         self.next_id = 1
     
     def create_task(self, request: CreateTaskRequest) -> Task:
-        task_id = str(self.next_id)
-        self.next_id += 1
-        
-        due_date = None
+        # Parsed before any state changes so a rejected date leaves storage untouched
+        due_date = due_ts = None
         if request.due_date:
-            due_date = datetime.fromisoformat(request.due_date.replace('Z', '+00:00'))
+            due_date, due_ts = _parse_due_date(request.due_date)
+        
+        key = self.next_id
+        self.next_id += 1
         
-        task = Task(
-            id=task_id,
+        # Reuse a deleted Task when one is available; __init__ resets every field
+        task = self._free_tasks.pop() if self._free_tasks else Task.__new__(Task)
+        Task.__init__(
+            task,
+            id=str(key),
             title=request.title,
             description=request.description,
             priority=request.priority,
-            created_at=datetime.now(),
+            created_at=_now(),
             due_date=due_date,
-            tags=request.tags
+            tags=[sys.intern(tag) for tag in request.tags]
         )
+        task._key = key
+        task._due_ts = due_ts
         
-        self.tasks[task_id] = task
+        self.tasks[key] = task
+        self._json_cache[key] = task.to_json_dict()
+        self._by_status[task.status].add(key)
+        self._add_tags(key, task.tags)
+        self._by_priority_counts[task.priority] += 1
+        self._ordered.add(self._sort_key(task))
+        self._track_due(task)
+        self._invalidate()
         return task
     
     def get_task(self, task_id: str) -> Optional[Task]:
-        return self.tasks.get(task_id)
+        return self.tasks.get(_task_key(task_id))
     
     def update_task(self, task_id: str, updates: UpdateTaskRequest) -> Optional[Task]:
-        task = self.tasks.get(task_id)
+        task = self.tasks.get(_task_key(task_id))
         if not task:
             return None
+        key = task._key
         
         update_data = {}
-        for field, value in updates.model_dump(exclude_unset=True).items():
-            if field == 'due_date' and value:
-                update_data[field] = datetime.fromisoformat(value.replace('Z', '+00:00'))
-            elif field == 'status' and value == TaskStatus.COMPLETED and task.status != TaskStatus.COMPLETED:
-                update_data[field] = value
-                update_data['completed_at'] = datetime.now()
+        # Only fields the caller actually sent, without building a model_dump dict
+        for name in updates.model_fields_set:
+            value = getattr(updates, name)
+            if value is None and name not in ('description', 'due_date'):
+                # Only description and due_date can be cleared
+                continue
+            if name == 'due_date':
+                # Parsed before any state changes so a rejected date leaves storage untouched
+                update_data[name], update_data['_due_ts'] = _parse_due_date(value) if value else (None, None)
+            elif name == 'tags':
+                update_data[name] = [sys.intern(tag) for tag in value]
+            elif name == 'status' and value == TaskStatus.COMPLETED and task.status != TaskStatus.COMPLETED:
+                update_data[name] = value
+                update_data['completed_at'] = _now()
             else:
-                update_data[field] = value
+                update_data[name] = value
         
-        for field, value in update_data.items():
-            setattr(task, field, value)
+        old_status, old_priority, old_tags = task.status, task.priority, task.tags
+        old_sort_key = self._sort_key(task)
         
+        for name, value in update_data.items():
+            setattr(task, name, value)
+        
+        # Move the task between index buckets only where it actually changed
+        if task.status != old_status:
+            self._by_status[old_status].discard(key)
+            self._by_status[task.status].add(key)
+            task._refresh_status()
+        if task.priority != old_priority:
+            self._by_priority_counts[old_priority] -= 1
+            self._by_priority_counts[task.priority] += 1
+            task._refresh_priority()
+            self._ordered.remove(old_sort_key)
+            self._ordered.add(self._sort_key(task))
+        if task.tags is not old_tags:
+            self._remove_tags(key, old_tags)
+            self._add_tags(key, task.tags)
+        if 'due_date' in update_data or (task.status == TaskStatus.COMPLETED) != (old_status == TaskStatus.COMPLETED):
+            self._overdue.discard(key)
+            self._track_due(task)
+        
+        self._json_cache[key] = task.to_json_dict()
+        self._invalidate(task)
         return task
     
     def delete_task(self, task_id: str) -> bool:
-        if task_id in self.tasks:
-            del self.tasks[task_id]
-            return True
-        return False
+        key = _task_key(task_id)
+        task = self.tasks.pop(key, None)
+        if task is None:
+            return False
+        
+        del self._json_cache[key]
+        self._by_status[task.status].discard(key)
+        self._remove_tags(key, task.tags)
+        self._by_priority_counts[task.priority] -= 1
+        self._ordered.remove(self._sort_key(task))
+        self._overdue.discard(key)
+        self._invalidate(task)
+        
+        if len(self._free_tasks) < _TASK_FREELIST_CAPACITY:
+            # Release what the task references before parking it for reuse
+            task.description = task.due_date = task.completed_at = None
+            task.tags.clear()
+            self._free_tasks.append(task)
+        return True
+    
+    def task_json(self, task: Task) -> Dict[str, Any]:
+        return self._json_cache[task._key]
+    
+    def list_task_dicts(self, status: Optional[TaskStatus] = None, tag: Optional[str] = None) -> Tuple[Dict[str, Any], ...]:
+        # Cached dicts are replaced rather than mutated when a task changes, so they are shared as-is
+        return tuple(map(self.task_json, self.list_tasks(status, tag)))
     
     def list_tasks(self, status: Optional[TaskStatus] = None, tag: Optional[str] = None) -> List[Task]:
-        tasks = list(self.tasks.values())
+        if not status and not tag:
+            # The ordered index already holds every task sorted by priority and creation date
+            return [self.tasks[sort_key[2]] for sort_key in self._ordered]
         
-        if status:
-            tasks = [t for t in tasks if t.status == status]
-        
-        if tag:
-            tasks = [t for t in tasks if tag in t.tags]
+        if status and tag:
+            keys = self._by_status[status] & self._by_tag.get(tag, set())
+        elif status:
+            keys = self._by_status[status]
+        else:
+            keys = self._by_tag.get(tag, set())
         
-        # Sort by priority and creation date
-        priority_order = {Priority.URGENT: 0, Priority.HIGH: 1, Priority.MEDIUM: 2, Priority.LOW: 3}
-        tasks.sort(key=lambda t: (priority_order[t.priority], t.created_at))
+        # Sort by priority and creation date, ties broken by id
+        tasks = [self.tasks[key] for key in sorted(keys)]
+        tasks.sort(key=attrgetter('priority_rank', 'created_at'))
         
         return tasks
     
+    def list_and_stats(self, limit: Optional[int] = None) -> Tuple[List[Task], Dict[str, Any]]:
+        # Both halves come from the indexes: a slice of the ordered index plus get_stats
+        tasks = [self.tasks[sort_key[2]] for sort_key in self._ordered.islice(stop=limit)]
+        return tasks, self.get_stats()
+    
     def get_stats(self) -> Dict[str, Any]:
-        tasks = list(self.tasks.values())
-        total = len(tasks)
+        total = len(self.tasks)
         
         if total == 0:
             return {"total": 0, "by_status": {}, "by_priority": {}}
         
-        by_status = {}
-        by_priority = {}
-        overdue = 0
+        by_status = {status.value: len(ids) for status, ids in self._by_status.items() if ids}
+        by_priority = {priority.value: count for priority, count in self._by_priority_counts.items() if count}
         
-        now = datetime.now()
-        
-        for task in tasks:
-            # Count by status
-            status_key = task.status.value
-            by_status[status_key] = by_status.get(status_key, 0) + 1
-            
-            # Count by priority
-            priority_key = task.priority.value
-            by_priority[priority_key] = by_priority.get(priority_key, 0) + 1
-            
-            # Count overdue
-            if task.due_date and task.due_date < now and task.status != TaskStatus.COMPLETED:
-                overdue += 1
+        self._refresh_overdue()
         
         return {
             "total": total,
             "by_status": by_status,
             "by_priority": by_priority,
-            "overdue": overdue
+            "overdue": len(self._overdue)
         }
+    
+    def task_markdown(self, task: Task) -> str:
+        markdown = self._task_markdown.get(task._key)
+        if markdown is None:
+            markdown = self._task_markdown[task._key] = _render_task_markdown(task)
+        return markdown
+    
+    def summary_markdown(self) -> str:
+        # The summary shows the overdue count, so expired due dates must be swept first
+        self._refresh_overdue()
+        if self._summary_markdown is None:
+            # Show first 10 tasks
+            self._summary_markdown = _render_summary_markdown(*self.list_and_stats(limit=10))
+        return self._summary_markdown
+    
+    def stats_json(self) -> str:
+        # The stats include the overdue count, so expired due dates must be swept first
+        self._refresh_overdue()
+        if self._stats_json is None:
+            self._stats_json = json.dumps(self.get_stats())
+        return self._stats_json
+    
+    def _refresh_overdue(self) -> None:
+        # Only entries whose due date has passed since the last call are popped
+        now = time.time()
+        overdue_before = len(self._overdue)
+        while self._due_heap and self._due_heap[0][0] < now:
+            due, key = heapq.heappop(self._due_heap)
+            if self._is_due_entry_current(due, key):
+                task = self.tasks[key]
+                task._heap_ts = None
+                if task.status != TaskStatus.COMPLETED:
+                    self._overdue.add(key)
+        if len(self._overdue) != overdue_before:
+            # The overdue count changes with the clock alone, so cached views go stale
+            self._invalidate()
+    
+    def _invalidate(self, task: Optional[Task] = None) -> None:
+        self._summary_markdown = None
+        self._stats_json = None
+        if task is not None:
+            self._task_markdown.pop(task._key, None)
+    
+    def _sort_key(self, task: Task) -> Tuple[int, datetime, int]:
+        return (task.priority_rank, task.created_at, task._key)
+    
+    def _track_due(self, task: Task) -> None:
+        # Each task has at most one current heap entry, for its current due date; completed
+        # tasks keep theirs so reopening one before the due date needs no new push
+        if task._due_ts is None:
+            task._heap_ts = None
+            return
+        if task._heap_ts == task._due_ts:
+            return
+        heapq.heappush(self._due_heap, (task._due_ts, task._key))
+        task._heap_ts = task._due_ts
+        if len(self._due_heap) > 2 * len(self.tasks) + 64:
+            # Too many stale entries from edits and deletes; rebuild from the current ones
+            self._due_heap = list({entry for entry in self._due_heap if self._is_due_entry_current(*entry)})
+            heapq.heapify(self._due_heap)
+    
+    def _is_due_entry_current(self, due: float, key: int) -> bool:
+        task = self.tasks.get(key)
+        return task is not None and task._heap_ts == due
+    
+    def _add_tags(self, key: int, tags: List[str]) -> None:
+        for tag in tags:
+            self._by_tag.setdefault(tag, set()).add(key)
+    
+    def _remove_tags(self, key: int, tags: List[str]) -> None:
+        for tag in tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
 
 
 # Initialize FastMCP server with CORS configuration
@@ -177,50 +445,56 @@ mcp = FastMCP(
 storage = TaskStorage()
 
 
+# Every endpoint that touches storage is async so FastMCP runs it on the event
+# loop instead of a worker thread. TaskStorage methods never await, so each call
+# completes before the next one starts and storage needs no locking.
+
 # Tools (actions that can be performed)
 @mcp.tool
-def create_task(request: CreateTaskRequest) -> Dict[str, Any]:
+async def create_task(request: CreateTaskRequest) -> Dict[str, Any]:
     """Create a new task with the specified details."""
     try:
         task = storage.create_task(request)
-        return {
-            "success": True,
-            "task": task.model_dump(mode='json'),
-            "message": f"Task '{task.title}' created successfully with ID {task.id}"
-        }
-    except Exception as e:
+    except BadDueDate as e:
         return {"success": False, "error": str(e)}
+    
+    return {
+        "success": True,
+        "task": storage.task_json(task),
+        "message": f"Task '{task.title}' created successfully with ID {task.id}"
+    }
 
 
 @mcp.tool
-def get_task(task_id: str) -> Dict[str, Any]:
+async def get_task(task_id: str) -> Dict[str, Any]:
     """Retrieve a specific task by its ID."""
     task = storage.get_task(task_id)
     if task:
-        return {"success": True, "task": task.model_dump(mode='json')}
+        return {"success": True, "task": storage.task_json(task)}
     else:
         return {"success": False, "error": f"Task with ID {task_id} not found"}
 
 
 @mcp.tool
-def update_task(task_id: str, updates: UpdateTaskRequest) -> Dict[str, Any]:
+async def update_task(task_id: str, updates: UpdateTaskRequest) -> Dict[str, Any]:
     """Update an existing task with new information."""
     try:
         task = storage.update_task(task_id, updates)
-        if task:
-            return {
-                "success": True,
-                "task": task.model_dump(mode='json'),
-                "message": f"Task {task_id} updated successfully"
-            }
-        else:
-            return {"success": False, "error": f"Task with ID {task_id} not found"}
-    except Exception as e:
+    except BadDueDate as e:
         return {"success": False, "error": str(e)}
+    
+    if task:
+        return {
+            "success": True,
+            "task": storage.task_json(task),
+            "message": f"Task {task_id} updated successfully"
+        }
+    else:
+        return {"success": False, "error": f"Task with ID {task_id} not found"}
 
 
 @mcp.tool
-def delete_task(task_id: str) -> Dict[str, Any]:
+async def delete_task(task_id: str) -> Dict[str, Any]:
     """Delete a task by its ID."""
     if storage.delete_task(task_id):
         return {"success": True, "message": f"Task {task_id} deleted successfully"}
@@ -229,125 +503,104 @@ def delete_task(task_id: str) -> Dict[str, Any]:
 
 
 @mcp.tool
-def list_tasks(status: Optional[str] = None, tag: Optional[str] = None) -> Dict[str, Any]:
+async def list_tasks(status: Optional[str] = None, tag: Optional[str] = None) -> Dict[str, Any]:
     """List all tasks, optionally filtered by status or tag."""
     try:
         task_status = TaskStatus(status) if status else None
-        tasks = storage.list_tasks(status=task_status, tag=tag)
-        
-        return {
-            "success": True,
-            "tasks": [task.model_dump(mode='json') for task in tasks],
-            "count": len(tasks)
-        }
-    except ValueError as e:
+    except ValueError:
         return {"success": False, "error": f"Invalid status: {status}"}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    
+    tasks = storage.list_task_dicts(status=task_status, tag=tag)
+    return {
+        "success": True,
+        "tasks": tasks,
+        "count": len(tasks)
+    }
 
 
 @mcp.tool
-def complete_task(task_id: str) -> Dict[str, Any]:
+async def complete_task(task_id: str) -> Dict[str, Any]:
     """Mark a task as completed."""
     updates = UpdateTaskRequest(status=TaskStatus.COMPLETED)
-    return update_task(task_id, updates)
+    return await update_task(task_id, updates)
 
 
 @mcp.tool
-def get_task_stats() -> Dict[str, Any]:
+async def get_task_stats() -> Dict[str, Any]:
     """Get statistics about all tasks."""
-    try:
-        stats = storage.get_stats()
-        return {"success": True, "stats": stats}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+    stats = storage.get_stats()
+    return {"success": True, "stats": stats}
 
 
 # Resources (data that can be read)
 @mcp.resource("task://{task_id}")
-def get_task_resource(task_id: str) -> str:
+async def get_task_resource(task_id: str) -> str:
     """Get detailed information about a specific task."""
     task = storage.get_task(task_id)
     if not task:
         return f"Task {task_id} not found"
     
-    status_emoji = {
-        TaskStatus.TODO: "📋",
-        TaskStatus.IN_PROGRESS: "⏳",
-        TaskStatus.COMPLETED: "✅",
-        TaskStatus.CANCELLED: "❌"
-    }
-    
-    priority_emoji = {
-        Priority.LOW: "🟢",
-        Priority.MEDIUM: "🟡",
-        Priority.HIGH: "🟠",
-        Priority.URGENT: "🔴"
-    }
-    
-    result = f"""# Task: {task.title}
+    return storage.task_markdown(task)
+
+
+@mcp.resource("tasks://all")
+async def get_all_tasks_resource() -> str:
+    """Get a summary of all tasks."""
+    return storage.summary_markdown()
 
-{status_emoji.get(task.status, "📋")} **Status**: {task.status.value.title()}
-{priority_emoji.get(task.priority, "🟡")} **Priority**: {task.priority.value.title()}
-📅 **Created**: {task.created_at.strftime('%Y-%m-%d %H:%M:%S')}
-"""
+
+def _render_task_markdown(task: Task) -> str:
+    parts = [f"""# Task: {task.title}
+
+{task._status_line}
+{task._priority_line}
+📅 **Created**: {task._created_str}
+"""]
 
     if task.description:
-        result += f"\n📝 **Description**: {task.description}"
+        parts.append(f"\n📝 **Description**: {task.description}")
     
     if task.due_date:
-        result += f"\n⏰ **Due Date**: {task.due_date.strftime('%Y-%m-%d %H:%M:%S')}"
+        parts.append(f"\n⏰ **Due Date**: {task.due_date.strftime(_DISPLAY_DATE_FORMAT)}")
     
     if task.completed_at:
-        result += f"\n✅ **Completed**: {task.completed_at.strftime('%Y-%m-%d %H:%M:%S')}"
+        parts.append(f"\n✅ **Completed**: {task.completed_at.strftime(_DISPLAY_DATE_FORMAT)}")
     
     if task.tags:
-        result += f"\n🏷️ **Tags**: {', '.join(task.tags)}"
+        parts.append(f"\n🏷️ **Tags**: {', '.join(task.tags)}")
     
-    return result
+    return ''.join(parts)
 
 
-@mcp.resource("tasks://all")
-def get_all_tasks_resource() -> str:
-    """Get a summary of all tasks."""
-    tasks = storage.list_tasks()
-    stats = storage.get_stats()
-    
+def _render_summary_markdown(tasks: List[Task], stats: Dict[str, Any]) -> str:
     if not tasks:
         return "No tasks found. Create your first task to get started!"
     
-    result = f"""# Task Summary
+    parts = [f"""# Task Summary
 
 📊 **Statistics**:
 - Total Tasks: {stats['total']}
 - Overdue: {stats.get('overdue', 0)}
 
 ## Tasks by Status:
-"""
+"""]
     
     for status, count in stats['by_status'].items():
-        result += f"- {status.replace('_', ' ').title()}: {count}\n"
+        parts.append(f"- {status.replace('_', ' ').title()}: {count}\n")
     
-    result += "\n## Recent Tasks:\n"
+    parts.append("\n## Recent Tasks:\n")
     
-    # Show first 10 tasks
-    for task in tasks[:10]:
-        status_emoji = {"todo": "📋", "in_progress": "⏳", "completed": "✅", "cancelled": "❌"}
-        priority_emoji = {"low": "🟢", "medium": "🟡", "high": "🟠", "urgent": "🔴"}
-        
-        result += f"- {status_emoji.get(task.status.value, '📋')} {priority_emoji.get(task.priority.value, '🟡')} **{task.title}** (ID: {task.id})\n"
+    for task in tasks:
+        parts.append(f"- {_STATUS_EMOJI[task.status.value]} {_PRIORITY_EMOJI[task.priority.value]} **{task.title}** (ID: {task.id})\n")
     
-    if len(tasks) > 10:
-        result += f"\n... and {len(tasks) - 10} more tasks"
+    if stats['total'] > 10:
+        parts.append(f"\n... and {stats['total'] - 10} more tasks")
     
-    return result
+    return ''.join(parts)
 
 
 # Prompts (templates for LLM interactions)
-@mcp.prompt
-def task_planning_prompt() -> str:
-    """A prompt template for helping with task planning and organization."""
-    return """You are a helpful task management assistant. Help the user plan and organize their tasks effectively.
+_PROMPT_PREFIX: Final = """You are a helpful task management assistant. Help the user plan and organize their tasks effectively.
 
 Available task statuses:
 - todo: Task is planned but not started
@@ -368,14 +621,22 @@ When helping users:
 4. Help identify dependencies between tasks
 5. Suggest realistic timelines
 
-Current task statistics: {get_task_stats()}
+Current task statistics: """
+
+_PROMPT_SUFFIX: Final = """
 
 How can I help you organize your tasks today?"""
 
 
+@mcp.prompt
+async def task_planning_prompt() -> str:
+    """A prompt template for helping with task planning and organization."""
+    return _PROMPT_PREFIX + storage.stats_json() + _PROMPT_SUFFIX
+
+
 # Health check endpoint for Railway
 @mcp.tool
-def health_check() -> Dict[str, Any]:
+async def health_check() -> Dict[str, Any]:
     """Check if the server is running properly."""
     return {
         "status": "healthy",